@@ -1,49 +1,19 @@
-from .illuminate import Illuminate
-import collections
+from .illuminate import (
+    Illuminate, _compute_scale_factor, with_thread_lock)
 import numpy as np
-import xarray as xr
-import threading
-import signal
-import logging
-from functools import wraps
 from threading import RLock
+from contextlib import contextmanager
 
-
-class DelayedKeyboardInterrupt:
-    def __enter__(self):
-        self.signal_received = False
-        self._is_main_thread = threading.current_thread() is \
-            threading.main_thread()
-        if self._is_main_thread:
-            # the signal api is only available to the main thread in python
-            self.old_handler = signal.signal(signal.SIGINT, self.handler)
-
-    def handler(self, sig, frame):
-        self.signal_received = (sig, frame)
-        logging.debug('SIGINT received. Delaying KeyboardInterrupt.')
-
-    def __exit__(self, type, value, traceback):
-        # During the cleanup of objects, the signal handler of the main
-        # Thread might have already been set to None or something
-        if self._is_main_thread and self.old_handler is not None:
-            signal.signal(signal.SIGINT, self.old_handler)
-        if self.signal_received:
-            self.old_handler(*self.signal_received)
-
-
-def with_thread_lock(func):
-    @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        with self._thread_lock:
-            with DelayedKeyboardInterrupt():
-                return func(self, *args, **kwargs)
-    return wrapper
+# Names of the codes stored in FakeIlluminate._chroma_codes
+_CHROMA_NAMES = np.array(['rgb', 'uv'])
 
 
 class FakeIlluminate(Illuminate):
     __slots__ = [
         # All slots have been declared in Illuminate
     ]
+    # There is no serial communication to protect from interrupts
+    _needs_signal_guard = False
 
     def __init__(self, *args, maximum_current=8, N_leds=377, **kwargs):
         """Basic fake illuminate device.
@@ -53,47 +23,36 @@ class FakeIlluminate(Illuminate):
         kwargs.setdefault('precision', 8)
         kwargs.setdefault('interface_bit_depth', 16)
         self._thread_lock = RLock()
+        self._batch = None
         self.N_leds = N_leds
+        # Shared by every call to fill_array, make sure that users cannot
+        # modify it
+        self._all_leds_array = np.arange(N_leds, dtype=np.int32)
+        self._all_leds_array.flags.writeable = False
         self.autoclear = True
         self._precision = kwargs['precision']
         self._interface_bit_depth = kwargs['interface_bit_depth']
+        self._interface_max = (1 << self._interface_bit_depth) - 1
         self._maximum_current = maximum_current
 
-        self._scale_factor = (
-            ((1 << self._interface_bit_depth) - 1) /
-            ((1 << self._precision) - 1)
-        )
+        self._scale_factor = _compute_scale_factor(
+            self._precision, self._interface_bit_depth)
         self.brightness = 1
 
-        self._led_positions = xr.DataArray(
-            # TODO: set this as np.empty when below is doen
-            np.zeros((self.N_leds, 3)),
-            dims=['led_number', 'zyx'],
-            coords={'led_number': np.arange(self.N_leds),
-                    'zyx': ['z', 'y', 'x']})
-
-        self._led_positions[:, 1] = np.arange(self.N_leds) * 1E-3
-        self._led_positions[:, 2] = np.arange(self.N_leds) * 1E-3
-
-        uv_leds = self.uv_leds
-
-        chroma = xr.DataArray(
-            np.full(self.N_leds, fill_value='rgb', dtype='<U3'),
-            dims=['led_number'])
-        chroma[uv_leds] = 'uv'
-        self._led_positions = self._led_positions.assign_coords(
-            chroma=chroma)
-
-        led_state = xr.DataArray(
-            np.zeros((self.N_leds, 3)),
-            dims=['led_number', 'rgb'],
-            coords={'led_number': np.arange(self.N_leds),
-                    'rgb': ['r', 'g', 'b']})
-        led_state['precision'] = self.precision
-        led_state['firmware_version'] = self.version
-        led_state['device_name'] = self.device_name
-        led_state['serial_number'] = self.serial_number
-        self._led_state = led_state
+        # Keep the raw arrays around and only wrap them in xarray
+        # DataArrays when they are requested.
+        self._led_positions_array = np.zeros((self.N_leds, 3))
+        # Both y and x are set from the same ramp
+        self._led_positions_array[:, 1:] = (
+            np.arange(self.N_leds) * 1E-3)[:, np.newaxis]
+        self._led_positions = None
+
+        # 0 for rgb LEDs, 1 for uv LEDs
+        self._chroma_codes = np.zeros(self.N_leds, dtype=np.uint8)
+        self._chroma_codes[self.uv_leds] = 1
+
+        self._led_state_array = np.zeros((self.N_leds, 3))
+        self._led_state = None
 
         # Clear the LEDs
         self.led = None
@@ -130,6 +89,11 @@ class FakeIlluminate(Illuminate):
     def __exit__(self, *args):
         self.close()
 
+    @contextmanager
+    def batch(self):
+        # Nothing is sent to a device, so there is nothing to group
+        yield
+
     @property
     def led(self):
         return self._led
@@ -140,28 +104,18 @@ class FakeIlluminate(Illuminate):
             clear_result = self.clear()
             return clear_result
 
+        # Keep the values as given, like turn_on_led does
         if isinstance(leds, np.ndarray):
-            # As 1D
-            leds = leds.reshape(-1).tolist()
-
-        try:
-            self._led = list(leds)
-        except TypeError:
-            # Make it a tuple
-            self._led = (leds, )
-
-    @property
-    def brightness(self):
-        if (self._color[0] == self._color[2] and
-                self._color[1] == self._color[1]):
-            return self._color[0]
+            # As 1D, copied so that the caller's array is not shared
+            leds = leds.flatten()
         else:
-            raise ValueError('The RGB values are not equal. To access their '
-                             'value, use the `color` property instead.')
+            try:
+                leds = list(leds)
+            except TypeError:
+                # Make it a tuple
+                leds = (leds, )
 
-    @brightness.setter
-    def brightness(self, b):
-        self.color = (b, b, b)
+        self._led = leds
 
     @property
     def color(self):
@@ -171,17 +125,21 @@ class FakeIlluminate(Illuminate):
     @color.setter
     @with_thread_lock
     def color(self, c):
-        if not isinstance(c, collections.abc.Iterable):
+        if isinstance(c, (int, float, np.number)):
             # Make it a 3 tuple
             c = (c,) * 3
 
+        scale_factor = self._scale_factor
+        red, green, blue = c
+
         # Downcast to int for safety
-        c = tuple(int(i * self._scale_factor) for i in c)
+        red = int(red * scale_factor)
+        green = int(green * scale_factor)
+        blue = int(blue * scale_factor)
 
         # Remember the user color, in the units the user provided it
-        user_color = tuple(float(i / self._scale_factor) for i in c)
-
-        self._color = user_color
+        self._color = (
+            red / scale_factor, green / scale_factor, blue / scale_factor)
 
     @with_thread_lock
     def clear(self):
@@ -190,12 +148,41 @@ class FakeIlluminate(Illuminate):
     @with_thread_lock
     def fill_array(self, led_type='rgb'):
         # Ignore led_type for the fake illuminate device
-        self._led = list(range(self.N_leds))
+        self._led = self._all_leds_array
 
     @property
     def led_positions(self):
+        if self._led_positions is None:
+            import xarray as xr
+            self._led_positions = xr.DataArray(
+                self._led_positions_array,
+                dims=['led_number', 'zyx'],
+                coords={'led_number': np.arange(self.N_leds),
+                        'zyx': ['z', 'y', 'x'],
+                        'chroma': ('led_number', self.chroma)})
         return self._led_positions
 
+    @property
+    def chroma(self):
+        """Type of each LED, either ``'rgb'`` or ``'uv'``."""
+        return _CHROMA_NAMES[self._chroma_codes]
+
+    @property
+    def led_state(self):
+        if self._led_state is None:
+            import xarray as xr
+            led_state = xr.DataArray(
+                self._led_state_array,
+                dims=['led_number', 'rgb'],
+                coords={'led_number': np.arange(self.N_leds),
+                        'rgb': ['r', 'g', 'b']})
+            led_state['precision'] = self.precision
+            led_state['firmware_version'] = self.version
+            led_state['device_name'] = self.device_name
+            led_state['serial_number'] = self.serial_number
+            self._led_state = led_state
+        return self._led_state
+
     @property
     def uv_leds(self):
         return [self.N_leds - 1]
@@ -1,6 +1,6 @@
 import json
 import re
-from time import sleep
+from time import monotonic, sleep
 from warnings import warn
 from typing import List, Union, Optional, Iterable, Tuple
 import collections
@@ -8,15 +8,22 @@ from packaging.version import Version
 
 import numpy as np
 from serial import Serial, SerialException
-from serial.tools.list_ports import comports
 from multiuserfilelock import MultiUserFileLock, tmpdir, Timeout
 from pathlib import Path
 import threading
 import signal
 import logging
-from functools import wraps
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from threading import RLock
 
+try:
+    # orjson parses the large pledpos replies much faster when it is
+    # available. Its JSONDecodeError subclasses json.JSONDecodeError.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 locks_dir = Path(tmpdir) / 'pyilluminate'
 
 """
@@ -43,9 +50,11 @@ known_serial_numbers = [
     for d in known_devices
     if d['serial_number']  # empty strings and NULL are Falsy
 ]
+# Keyed by the lower case MAC address
 known_mac_addresses = {
-    d['mac_address']: d['serial_number']
+    d['mac_address'].lower(): d['serial_number']
     for d in known_devices
+    if d.get('mac_address')
 }
 
 
@@ -56,12 +65,47 @@ known_mac_addresses = {
 # https://forum.pjrc.com/threads/54773-Inreasing-USB-Serial-Buffer-Teensy-3-2
 MAX_ARGUMENT_CHAR_COUNT = 64 * 1
 
+# Firmware versions that changed the startup procedure
+_VERSION_1_13 = Version('1.13')
+_VERSION_1_21_0 = Version('1.21.0')
+
+# Scale from the z[cm], y[mm], x[mm] LED positions reported by the board
+_ZYX_TO_METERS = np.array([0.01, 0.001, 0.001])
+
+# Number at the end of a reply line
+_NUMBER_RE = re.compile(r'[-+]?\d*\.?\d?$')
+
+# Pre-encoded commands that never take arguments
+_CMD_CLEAR = b'x\n'
+_CMD_UPDATE = b'u\n'
+_CMD_FILL_ARRAY = b'ff\n'
+_CMD_BRIGHTFIELD = b'bf\n'
+_CMD_DARKFIELD = b'df\n'
+_CMD_REBOOT = b'reboot\n'
+_CMD_RESET_SEQUENCE = b'reseq\n'
+_CMD_DEMO = b'demo\n'
+_CMD_WATER_DROP_DEMO = b'water\n'
+_CMD_BRIGHTNESS_MAX = b'sb.max\n'
+_CMD_AUTOCLEAR_ON = b'ac.1\n'
+_CMD_AUTOCLEAR_OFF = b'ac.0\n'
+_CMD_AUTOUPDATE_ON = b'au.1\n'
+_CMD_AUTOUPDATE_OFF = b'au.0\n'
+# Older firmware does not know some of these toggles and replies with an
+# error, their replies are read but not checked
+_UNCHECKED_COMMANDS = frozenset([
+    _CMD_AUTOCLEAR_ON, _CMD_AUTOCLEAR_OFF,
+    _CMD_AUTOUPDATE_ON, _CMD_AUTOUPDATE_OFF,
+])
+
+
+# The main thread never changes, look it up once
+_MAIN_THREAD = threading.main_thread()
+
 
 class DelayedKeyboardInterrupt:
     def __enter__(self):
         self.signal_received = False
-        self._is_main_thread = threading.current_thread() is \
-            threading.main_thread()
+        self._is_main_thread = threading.current_thread() is _MAIN_THREAD
         if self._is_main_thread:
             # the signal api is only available to the main thread in python
             self.old_handler = signal.signal(signal.SIGINT, self.handler)
@@ -83,19 +127,94 @@ def with_thread_lock(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         with self._thread_lock:
+            if not self._needs_signal_guard:
+                return func(self, *args, **kwargs)
             with DelayedKeyboardInterrupt():
                 return func(self, *args, **kwargs)
     return wrapper
 
 
+@lru_cache(maxsize=32)
+def _compute_scale_factor(precision, interface_bit_depth):
+    """Ratio between the board color integers and the user color values."""
+    if precision == 'float':
+        return (1 << interface_bit_depth) - 1
+    return ((1 << interface_bit_depth) - 1) / ((1 << precision) - 1)
+
+
+@lru_cache(maxsize=8)
+def _led_number_table(led_count):
+    """Encoded decimal strings of every LED number on a board."""
+    return tuple(str(i).encode() for i in range(led_count))
+
+
+@lru_cache(maxsize=8)
+def _led_number_array(led_count):
+    """The same table as an object array, to gather from integer arrays."""
+    table = np.empty(led_count, dtype=object)
+    table[:] = _led_number_table(led_count)
+    table.flags.writeable = False
+    return table
+
+
+def _encode_led_numbers(leds, led_count):
+    """Encode the LED numbers as bytes for the serial commands."""
+    if isinstance(leds, np.ndarray):
+        if (leds.size != 0 and leds.ndim == 1 and
+                leds.dtype.kind in 'iu' and
+                leds.min() >= 0 and leds.max() < led_count):
+            return _led_number_array(led_count)[leds].tolist()
+        leds = leds.tolist()
+    table = _led_number_table(led_count)
+    # Anything else, such as numbers outside of the board, is sent as
+    # written so that the firmware can report the error
+    return [table[led] if type(led) is int and 0 <= led < led_count
+            else str(led).encode() for led in leds]
+
+
+# Listing the serial ports can take hundreds of milliseconds on Windows.
+# Reuse the last listing for a short while.
+_COMPORTS_CACHE_TTL = 2.0
+# The listing is also indexed by device name
+_comports_cache = (0.0, None, None)
+
+
+def _refresh_comports_cache(refresh):
+    global _comports_cache
+    timestamp, coms, coms_by_device = _comports_cache
+    now = monotonic()
+    if refresh or coms is None or now - timestamp > _COMPORTS_CACHE_TTL:
+        from serial.tools.list_ports import comports
+        coms = comports()
+        coms_by_device = {c.device: c for c in coms}
+        _comports_cache = (now, coms, coms_by_device)
+    return _comports_cache
+
+
+def _cached_comports(refresh=False):
+    return _refresh_comports_cache(refresh)[1]
+
+
+def _paragraph_lines(paragraph: bytes, raw: bool=False) -> List[str]:
+    """Split a paragraph received from the board into its lines."""
+    text = paragraph.decode('utf-8')
+    # The last element is the empty string after the final newline
+    lines = text.split('\n')[:-1]
+    if raw:
+        return [line + '\n' for line in lines]
+    return [line_clean for line_clean in
+            (line.strip().strip('-= ') for line in lines)
+            if line_clean]
+
+
 def get_port_serial_number(port):
-    coms = comports()
-    for c in coms:
-        if c.device == port:
-            return c.serial_number
+    # Only list the ports again if the port was plugged in recently
+    for refresh in (False, True):
+        coms_by_device = _refresh_comports_cache(refresh)[2]
+        if port in coms_by_device:
+            return coms_by_device[port].serial_number
 
-    else:
-        raise ValueError(f"Did not find the requested port: {port}")
+    raise ValueError(f"Did not find the requested port: {port}")
 
 
 class Illuminate:
@@ -110,12 +229,15 @@ class Illuminate:
         'serial',
         '_led_positions',
         '_help',
+        '_about',
         '_led_state',
+        '_led_state_array',
         '_led_cache',
         '_maximum_current',
         '_color',
         '_mac_address',
         '_interface_bit_depth',
+        '_interface_max',
         '_precision',
         'serial_number',
         'reboot_on_start',
@@ -129,10 +251,28 @@ class Illuminate:
         '_autoupdate',
         '_scale_factor',
         '_thread_lock',
+        '_all_leds_array',
+        '_led_positions_array',
+        '_chroma_codes',
+        '_sequence',
+        '_sequence_length',
+        '_read_buffer',
+        '_parameters_json',
+        '_led_positions_NA',
+        '_firmware_version',
+        '_NA',
+        '_array_distance',
+        '_board_settings',
+        '_batch',
     ]
+    # Delay KeyboardInterrupts while serial transactions are in flight
+    # so that the board never receives half a command.
+    _needs_signal_guard = True
     _known_device = known_devices
     _known_serial_numbers = known_serial_numbers
     _known_mac_addresses = known_mac_addresses
+    # positions_as_xarray only warns about its deprecation once
+    _positions_as_xarray_warned = False
 
     @staticmethod
     def find(serial_numbers=None):
@@ -155,6 +295,9 @@ class Illuminate:
         match Teensy 3.1/3.2 microcontrollers that are connected to the
         computer but that may not be associated with the Illuminate boards.
 
+        The list of serial ports is cached for a few seconds. Call
+        ``refresh_ports`` to list them again right away.
+
         """
         pairs = Illuminate._device_serial_number_pairs(
             serial_numbers=serial_numbers)
@@ -184,6 +327,9 @@ class Illuminate:
         match Teensy 3.1/3.2 microcontrollers that are connected to the
         computer but that may not be associated with the Illuminate boards.
 
+        The list of serial ports is cached for a few seconds. Call
+        ``refresh_ports`` to list them again right away.
+
         """
         pairs = Illuminate._device_serial_number_pairs(
             serial_numbers=serial_numbers)
@@ -193,8 +339,13 @@ class Illuminate:
         return serial_numbers
 
     @staticmethod
-    def _device_serial_number_pairs(serial_numbers=None):
-        com = comports()
+    def refresh_ports():
+        """List the serial ports again instead of using the cached list."""
+        _cached_comports(refresh=True)
+
+    @staticmethod
+    def _device_serial_number_pairs(serial_numbers=None, refresh=False):
+        com = _cached_comports(refresh=refresh)
         pairs = [
             (c.device, c.serial_number)
             for c in com
@@ -245,9 +396,20 @@ class Illuminate:
         self._use_lock = use_lock
         self._lock = None
         self.serial = None
+        # Bytes received from the board that have not been consumed yet
+        self._read_buffer = bytearray()
         self._led_positions = None
         self._help = None
+        self._about = None
+        self._parameters_json = None
+        self._led_positions_NA = None
+        self._firmware_version = None
+        # Last command sent for each setting, see _ask_setting
+        self._board_settings = {}
+        # Commands waiting to be sent at the end of a batch
+        self._batch = None
         self._led_state = None
+        self._led_state_array = None
         self._led_cache = []
         self._maximum_current = maximum_current
 
@@ -257,6 +419,7 @@ class Illuminate:
         self._color = (0, 0, 0)
         self._mac_address = ""
         self._interface_bit_depth = 8
+        self._interface_max = (1 << 8) - 1
         if port is not None and serial_number is None:
             serial_number = get_port_serial_number(port)
 
@@ -281,18 +444,17 @@ class Illuminate:
         self.serial = Serial(port=None,
                              baudrate=baudrate, timeout=timeout,
                              exclusive=True)
-        # Make the buffer size really large since the LED positions,
-        # communicated as a JSON string take quite a few characters to send
-        if hasattr(self.serial, 'set_buffer_size'):
-            # this doesn't exist on all platforms
-            self.serial.set_buffer_size(rx_size=50000)
 
         if open_device:
             self.open()
 
     @classmethod
     def serial_by_mac_address(cls, mac_address: str) -> str:
-        serial_number = cls._known_mac_addresses.get(mac_address, None)
+        known_mac_addresses = cls._known_mac_addresses
+        serial_number = known_mac_addresses.get(mac_address, None)
+        if serial_number is None:
+            # MAC addresses are case insensitive
+            serial_number = known_mac_addresses.get(mac_address.lower(), None)
         if serial_number is not None:
             return serial_number
         else:
@@ -320,7 +482,7 @@ class Illuminate:
             'interface_bit_depth': 8,
             'mac_address': '',
         }
-        loaded_parameters = json.loads(p_raw)
+        loaded_parameters = _json_loads(p_raw)
         parameters.update(loaded_parameters)
 
         self.N_leds = parameters['led_count']
@@ -335,13 +497,18 @@ class Illuminate:
 
         self._interface_bit_depth = int(  # type: ignore
             parameters['interface_bit_depth'])  # type: ignore
+        # Largest color integer the board accepts
+        self._interface_max = (1 << self._interface_bit_depth) - 1
 
         # There are a ton of default properties that are not easy to read.
         # Maybe I can get Zack to implement reading them, but I'm not sure if
         # that will be possible.
 
+        # The DataArray wraps the raw buffer without copying it so that
+        # updates to the LED state can bypass xarray entirely.
+        led_state_array = np.zeros((self.N_leds, 3))
         led_state = xr.DataArray(
-            np.zeros((self.N_leds, 3)),
+            led_state_array,
             dims=['led_number', 'rgb'],
             coords={'led_number': np.arange(self.N_leds),
                     'rgb': ['r', 'g', 'b']})
@@ -350,6 +517,12 @@ class Illuminate:
         led_state['device_name'] = self.device_name
         led_state['serial_number'] = self.serial_number
         self._led_state = led_state
+        self._led_state_array = led_state_array
+
+        # Shared by every call to fill_array
+        all_leds_array = np.arange(self._led_count)
+        all_leds_array.flags.writeable = False
+        self._all_leds_array = all_leds_array
 
     @with_thread_lock
     def _read_led_positions(self):
@@ -359,16 +532,14 @@ class Illuminate:
 
         # as dictionary
         # Units at this point are in mm
-        # This function faults sometimes, therefore, we assign the result
-        # of ask_string to a variable, making debugging a little easier.
+        # This function faults sometimes, therefore, we retry it
         for _ in range(10):
             try:
                 # Because the pledpos serial communication can be really large
                 # the amount of data might not fit in the buffer on Windows
                 # This can cause the JSON data to be malformed, causing a
                 # decode error below
-                s = self._ask_string('pledpos')
-                p = json.loads(s)[
+                p = self._ask_json('pledpos')[
                     'led_position_list_cartesian']
                 break
             except json.JSONDecodeError as e:
@@ -377,21 +548,30 @@ class Illuminate:
         else:
             raise error
 
+        led_numbers = np.fromiter(
+            map(int, p.keys()), dtype=np.intp, count=len(p))
+        xyz = np.array(list(p.values()), dtype=float).reshape(-1, 3)
+
+        positions = np.empty((self.N_leds, 3))
+        # x, y are provided in units of mm
+        # z is provided in units of cm
+        # Reverse the columns to z, y, x and convert them all to meters
+        if (led_numbers.size == self.N_leds and
+                (led_numbers == np.arange(self.N_leds)).all()):
+            # The firmware sends the LEDs in order, write them in place
+            # instead of scattering them
+            np.multiply(xyz[:, ::-1], _ZYX_TO_METERS, out=positions)
+        else:
+            positions[led_numbers] = xyz[:, ::-1] * _ZYX_TO_METERS
+
         led_positions = xr.DataArray(
-            np.empty((self.N_leds, 3)),
+            positions,
             dims=['led_number', 'zyx'],
             coords={'led_number': np.arange(self.N_leds),
                     'zyx': ['z', 'y', 'x']})
         led_positions['serial_number'] = self.serial_number
         led_positions['firmware_version'] = self.version
         led_positions['device_name'] = self.device_name
-        for key, item in p.items():
-            # x, y are provided in units of mm
-            # z is provided in units of cm
-            key = int(key)
-            led_positions[key, 2] = item[0] * 0.001
-            led_positions[key, 1] = item[1] * 0.001
-            led_positions[key, 0] = item[2] * 0.01
 
         self._led_positions = led_positions
 
@@ -420,13 +600,17 @@ class Illuminate:
                 serial_numbers = None
             else:
                 serial_numbers = [self.serial_number]
-            available_ports = self._device_serial_number_pairs(
-                serial_numbers)
-            if len(self._known_serial_numbers) != 0:
-                available_ports = [p
-                                   for p in available_ports
-                                   if p[1] in self._known_serial_numbers]
-            if len(available_ports) == 0:
+            # Only list the ports again if the board was plugged in recently
+            for refresh in (False, True):
+                available_ports = self._device_serial_number_pairs(
+                    serial_numbers, refresh=refresh)
+                if len(self._known_serial_numbers) != 0:
+                    available_ports = [p
+                                       for p in available_ports
+                                       if p[1] in self._known_serial_numbers]
+                if len(available_ports) != 0:
+                    break
+            else:
                 raise RuntimeError("No Illuminate devices found")
 
             port, serial_number = available_ports[0]
@@ -435,7 +619,7 @@ class Illuminate:
 
     @with_thread_lock
     def open(self) -> None:
-        if not self.serial.isOpen():
+        if not self.serial.is_open:
             self._find_port_number()
             self._lock_acquire()
             # 2021/07/19: Mark
@@ -458,7 +642,7 @@ class Illuminate:
                 pass
 
             # Check to see if it worked or not.
-            if self.serial.isOpen():
+            if self.serial.is_open:
                 return
 
             # Sleep to allow things to calm down???
@@ -474,7 +658,7 @@ class Illuminate:
     @with_thread_lock
     def _open(self) -> None:
         """Open the serial port. Only useful if you closed it."""
-        if not self.serial.isOpen():
+        if not self.serial.is_open:
             self._find_port_number()
             try:
                 self.serial.open()
@@ -484,6 +668,21 @@ class Illuminate:
                     "establishing a new one. If there is a previous instance "
                     "of Illuminate either delete the object or call the "
                     "'close' method.")
+            # Make the buffer size really large since the LED positions,
+            # communicated as a JSON string take quite a few characters to
+            # send. The buffer size can only be set once the port is open.
+            if hasattr(self.serial, 'set_buffer_size'):
+                # this doesn't exist on all platforms
+                self.serial.set_buffer_size(rx_size=1 << 20)
+            if hasattr(self.serial, 'set_low_latency_mode'):
+                # Ask the driver to hand over received bytes right away
+                # instead of waiting for its latency timer to expire.
+                # this doesn't exist on all platforms, and not all USB
+                # serial drivers support it
+                try:
+                    self.serial.set_low_latency_mode(True)
+                except (ValueError, OSError):
+                    pass
 
         try:
             self._open_startup_procedure()
@@ -494,6 +693,7 @@ class Illuminate:
         # Reset cached variables
         self._led_positions = None
         self._help = None
+        self._about = None
 
         # get/set firmware constants
         self.maximum_current = self._maximum_current
@@ -501,10 +701,17 @@ class Illuminate:
     @with_thread_lock
     def _open_startup_procedure(self):
         sleep(0.1)
-
+        # The board may have been changed while it was closed
+        self._parameters_json = None
+        self._led_positions_NA = None
+        self._firmware_version = None
+        self._board_settings.clear()
+
+        # _open also runs this on a port that was already open, so
+        # anything still waiting to be sent must be discarded too
         self.serial.reset_output_buffer()
         self.serial.reset_input_buffer()
-        self.serial.flush()
+        self._read_buffer.clear()
 
         if self.serial.in_waiting != 0:
             self.close()
@@ -527,68 +734,73 @@ class Illuminate:
 
         version = Version(self.version)
 
-        # Set it to clear between commands.
-        # This may have changed due to the user having previously
-        # Opened the Illuminate board, so we set it to a safe default
-        self.autoclear = True
-        self.autoupdate = True
-
-        if version > Version('1.13') and version < Version('1.21.0'):
-            # As of version 1.21.0, "brightness" is no longer used
-            # in Ramona Optics hardware
-            # ALl boards that I have in my possension have been updated.
-            # The command color changed in version 0.14 such that
-            # each color would be multiplied by the value of brightness
-            # Therefore, we ensure that the brightness on the chip is set to
-            # max
-            # In fact more normalization is done, but we patch it away
-            # https://github.com/zfphil/illuminate/pull/18
-            self.ask('sb.max')
-
         if self._precision is None:
             self._precision = self._interface_bit_depth
 
-        if self._precision == 'float':
-            self._scale_factor = ((1 << self._interface_bit_depth) - 1)
-        else:
-            if self._precision > self._interface_bit_depth:
-                self.close()
-                raise ValueError(
-                    f"Selected precision {self._precision} is not supported "
-                    "by this LED board. "
-                    "This board only supports bit depths up to "
-                    f"{self._interface_bit_depth} bits."
-                    "Please contact support for more assistance.")
+        if (self._precision != 'float' and
+                self._precision > self._interface_bit_depth):
+            self.close()
+            raise ValueError(
+                f"Selected precision {self._precision} is not supported "
+                "by this LED board. "
+                "This board only supports bit depths up to "
+                f"{self._interface_bit_depth} bits."
+                "Please contact support for more assistance.")
+        self._scale_factor = _compute_scale_factor(
+            self._precision, self._interface_bit_depth)
+
+        # None of the replies are needed, send the commands together
+        with self.batch():
+            # Set it to clear between commands.
+            # This may have changed due to the user having previously
+            # Opened the Illuminate board, so we set it to a safe default
+            self.autoclear = True
+            self.autoupdate = True
+
+            if _VERSION_1_13 < version < _VERSION_1_21_0:
+                # As of version 1.21.0, "brightness" is no longer used
+                # in Ramona Optics hardware
+                # ALl boards that I have in my possension have been updated.
+                # The command color changed in version 0.14 such that
+                # each color would be multiplied by the value of brightness
+                # Therefore, we ensure that the brightness on the chip is set
+                # to max
+                # In fact more normalization is done, but we patch it away
+                # https://github.com/zfphil/illuminate/pull/18
+                self.ask(_CMD_BRIGHTNESS_MAX)
+
+            # Set the brightness low so we can live
+            if self._precision == 'float':
+                self.color = self.color_minimum_increment
             else:
-                self._scale_factor = (
-                    ((1 << self._interface_bit_depth) - 1) /
-                    ((1 << self._precision) - 1)
-                )
-
-        # Set the brightness low so we can live
-        if self._precision == 'float':
-            self.color = self.color_minimum_increment
-        else:
-            self.color = 1
+                self.color = 1
 
     def __del__(self):
-        self.close()
+        try:
+            self.close()
+        except Exception:
+            # __init__ may have failed before all the attributes were set,
+            # or the interpreter may be shutting down. There is nobody
+            # left to report the error to.
+            pass
 
     @with_thread_lock
     def close(self) -> None:
         """Force close the serial port."""
-        if self.serial is not None and self.serial.isOpen():
-            try:
-                self.clear()
-                self.serial.flush()
-            except SerialException:
-                # Ignore any Serial Exceptions that may arise due to
-                # a user prematurely removing the USB connection before the
-                # device is closed.
-                pass
-            self.serial.close()
-
-        self._lock_release()
+        try:
+            if self.serial is not None and self.serial.is_open:
+                try:
+                    self.clear()
+                    self.serial.flush()
+                except SerialException:
+                    # Ignore any Serial Exceptions that may arise due to
+                    # a user prematurely removing the USB connection before
+                    # the device is closed.
+                    pass
+                finally:
+                    self.serial.close()
+        finally:
+            self._lock_release()
 
     @staticmethod
     def _make_lock(
@@ -599,7 +811,7 @@ class Illuminate:
         # Check the udev rules file
         unique_pyilluminate_locktxt = locks_dir / f"{serial_number}.lock"
         # lock will only be called if the device is closed
-        # (when isOpen is called).
+        # (when is_open is False).
         return MultiUserFileLock(unique_pyilluminate_locktxt,
                                  group=group, chmod=chmod,
                                  timeout=0.001)
@@ -635,11 +847,12 @@ class Illuminate:
 
         If it is a string, encode it as 'utf-8'.
         """
-        if self.serial is None:
+        serial = self.serial
+        if serial is None:
             raise RuntimeError("__init__ must be successfully called first")
         if isinstance(data, str):
-            data = (data + '\n').encode('utf-8')
-        self.serial.write(data)
+            data = data.encode('utf-8') + b'\n'
+        serial.write(data)
 
     @with_thread_lock
     def read(self, size: int=10000) -> bytearray:
@@ -651,16 +864,31 @@ class Illuminate:
             bytearray of data read.
 
         """
-        if self.serial is None:
+        serial = self.serial
+        if serial is None:
             raise RuntimeError("__init__ must be successfully called first")
-        return self.serial.read(size)
+        buffer = self._read_buffer
+        if not buffer:
+            return serial.read(size)
+        data = bytes(buffer[:size])
+        del buffer[:size]
+        if len(data) < size:
+            data += serial.read(size - len(data))
+        return data
 
     @with_thread_lock
     def readline(self) -> str:
         """Call underlying readline and decode as utf-8."""
         if self.serial is None:
             raise RuntimeError("__init__ must be successfully called first")
-        b = self.serial.readline()
+        buffer = self._read_buffer
+        end = buffer.find(b'\n')
+        if end >= 0:
+            b = bytes(buffer[:end + 1])
+            del buffer[:end + 1]
+        else:
+            b = bytes(buffer) + self.serial.readline()
+            buffer.clear()
         return b.decode('utf-8')
 
     @with_thread_lock
@@ -673,33 +901,188 @@ class Illuminate:
             A list of the lines in the paragraph.
 
         """
-        paragraph = []
+        return _paragraph_lines(self._read_paragraph_bytes(), raw)
+
+    @with_thread_lock
+    def _read_paragraph_bytes(self) -> bytes:
+        """Read a whole paragraph, up to the end of its -==- line."""
+        serial = self.serial
+        if serial is None:
+            raise RuntimeError("__init__ must be successfully called first")
+        buffer = self._read_buffer
+        # Read whatever the board has sent so far in bulk instead of line by
+        # line, and only split the paragraph once it has fully arrived.
+        # Ok, so I don't know his exact end of paragraph string.
+        # it might be ' -==- \n', but there are inconsistencies with
+        # \r\n in Arduino, and probably in his code.
+        # This seems safer for now.
+        searched = 0
+        sentinel = -1
         while True:
-            line = self.readline()
-            if not line:
+            if sentinel < 0:
+                # The sentinel may straddle two reads
+                sentinel = buffer.find(b'-==-', max(searched - 3, 0))
+            if sentinel >= 0:
+                end = buffer.find(b'\n', sentinel)
+                if end >= 0:
+                    break
+            searched = len(buffer)
+            chunk = serial.read(serial.in_waiting or 1)
+            if not chunk:
                 raise RuntimeError("Timeout reading from serial")
-            line_stripped = line.strip()
+            buffer += chunk
 
-            line_clean = line_stripped.strip('-= ')
-            if raw:
-                paragraph.append(line)
-            elif line_clean:
-                paragraph.append(line_clean)
-
-            # Ok, so I don't know his exact end of paragraph string.
-            # it might be ' -==- \n', but there are inconsistencies with
-            # \r\n in Arduino, and probably in his code.
-            # This seems safer for now.
-            if '-==-' in line_stripped:
-                return paragraph
+        # Anything after the end of the paragraph is kept for the next read
+        paragraph = bytes(buffer[:end + 1])
+        del buffer[:end + 1]
+        return paragraph
 
     @with_thread_lock
-    def ask(self, data: str) -> Union[int, float, None]:
-        """Send data, read the output, check for error, extract a number."""
+    def ask(self, data: Union[str, bytes]) -> Union[int, float, None]:
+        """Send data, read the output, check for error, extract a number.
+
+        Bytes are sent as is and must include the trailing newline.
+        Within a ``batch``, the command is only queued and None is returned.
+        """
+        if self._batch is not None:
+            if isinstance(data, str):
+                data = data.encode('utf-8') + b'\n'
+            self._batch.append(data)
+            return None
         p = self._ask_list(data)
         self._check_output(p)
         return self._extract_number(p)
 
+    @with_thread_lock
+    def _ask_setting(self, name: str, command: bytes) -> bool:
+        """Send a command that changes a setting of the board.
+
+        The command is skipped if it was the last one sent for that setting.
+        Returns True if the command was sent.
+        """
+        board_settings = self._board_settings
+        if board_settings.get(name) == command:
+            return False
+        # Forget the setting in case the command fails
+        board_settings.pop(name, None)
+        self._tell(command)
+        board_settings[name] = command
+        return True
+
+    @with_thread_lock
+    def _tell(self, command: bytes) -> None:
+        """Send a command whose reply only needs to be checked for errors.
+
+        The command is bytes and must include the trailing newline.
+        The replies to the autoclear and autoupdate toggles are not checked.
+        """
+        if self._batch is not None:
+            self._batch.append(command)
+            return
+        self.write(command)
+        paragraph = self._read_paragraph_bytes()
+        # Most of these commands only reply with the end of paragraph
+        # marker, there is nothing to check
+        if (command not in _UNCHECKED_COMMANDS and
+                not paragraph.lstrip().startswith(b'-==-')):
+            self._check_output(_paragraph_lines(paragraph))
+
+    @with_thread_lock
+    def _ask_many(self, commands: Iterable[bytes]
+                  ) -> List[Union[int, float, None]]:
+        """Send many commands and return the number extracted from each reply.
+
+        Commands are written before the replies to the previous ones are
+        read, as long as the commands waiting for a reply fit in the teensy
+        buffer. This saves a round trip for most commands.
+        Commands are bytes and must include the trailing newline.
+        The replies to the autoclear and autoupdate toggles are not checked
+        for errors.
+        """
+        if self._batch is not None:
+            commands = list(commands)
+            self._batch.extend(commands)
+            return [None] * len(commands)
+        if self.serial is None:
+            raise RuntimeError("__init__ must be successfully called first")
+        write = self.serial.write
+        numbers = []
+        # Commands that have not been replied to yet
+        pending = collections.deque()
+        pending_size = 0
+
+        def read_reply():
+            nonlocal pending_size
+            command = pending.popleft()
+            pending_size -= len(command)
+            p = self.read_paragraph()
+            if command not in _UNCHECKED_COMMANDS:
+                self._check_output(p)
+            numbers.append(self._extract_number(p))
+
+        try:
+            for command in commands:
+                # See turn_on_led, the teensy loses data if too much of it
+                # is sent at once
+                while pending and (pending_size + len(command) >
+                                   MAX_ARGUMENT_CHAR_COUNT):
+                    read_reply()
+                write(command)
+                pending.append(command)
+                pending_size += len(command)
+            while pending:
+                read_reply()
+        except Exception:
+            # Don't let the replies to the commands that were already sent
+            # be mistaken for the replies to the next commands
+            for _ in pending:
+                try:
+                    self.read_paragraph()
+                except RuntimeError:
+                    break
+            raise
+        return numbers
+
+    @contextmanager
+    def batch(self):
+        """Send the commands issued within the block together.
+
+        The commands are queued and only sent when the block exits, without
+        waiting for the reply to each of them in turn. Replies are checked
+        for errors when the block exits. Only commands that do not need a
+        reply can be used in the block: the values they would return are
+        None.
+
+        Examples
+        --------
+        >>> with light.batch():
+        ...     light.color = (1, 0, 0)
+        ...     light.led = [1, 2, 3]
+
+        """
+        with self._thread_lock:
+            if self._batch is not None:
+                # Part of an enclosing batch
+                yield
+                return
+            self._batch = []
+            try:
+                yield
+                commands = self._batch
+            except BaseException:
+                # None of the queued commands were sent
+                self._board_settings.clear()
+                raise
+            finally:
+                self._batch = None
+            try:
+                self._ask_many(commands)
+            except BaseException:
+                # The settings remembered while queueing may not have been
+                # applied
+                self._board_settings.clear()
+                raise
+
     def _check_output(self, p) -> None:
         """Check for errors."""
         # Some commands just return -==-
@@ -728,7 +1111,13 @@ class Illuminate:
         # Often, if something is returned, it will be a number
         # so we need to extract it from his list
         # Get the last number from the last string
-        number = re.search(r'[-+]?\d*\.?\d?$', p[-1]).group(0)
+        last_line = p[-1]
+        # Most replies end in a plain integer, which can be converted
+        # without scanning the whole line with the regular expression
+        last_word = last_line.rpartition(' ')[2]
+        if last_word.isdecimal():
+            return int(last_word)
+        number = _NUMBER_RE.search(last_line).group(0)
         if number:
             if '.' in number:
                 return float(number)
@@ -738,13 +1127,27 @@ class Illuminate:
             return None
 
     @with_thread_lock
-    def _ask_list(self, data: str, raw: bool=False) -> List[str]:
+    def _ask_list(self, data: Union[str, bytes],
+                  raw: bool=False) -> List[str]:
         """Read data, return as list of strings."""
         self.write(data)
         return self.read_paragraph(raw)
 
     @with_thread_lock
-    def _ask_string(self, data: str, raw: bool =False) -> str:
+    def _ask_json(self, data: Union[str, bytes]):
+        """Read data, return the reply parsed as JSON.
+
+        The reply is parsed straight from the received bytes, without
+        splitting it into lines and joining them back.
+        """
+        self.write(data)
+        paragraph = self._read_paragraph_bytes()
+        # Drop the end of paragraph marker
+        return _json_loads(paragraph[:paragraph.rfind(b'-==-')])
+
+    @with_thread_lock
+    def _ask_string(self, data: Union[str, bytes],
+                    raw: bool=False) -> str:
         """Read data, return as a single string."""
         p = self._ask_list(data, raw)
         if p:
@@ -777,20 +1180,28 @@ class Illuminate:
     @property
     def about(self) -> str:
         """Display information about this LED Array."""
-        # Print the resulting string. Strip away all the superfluous chars
-        return self._ask_string('about')
+        if self._about is None:
+            # Print the resulting string. Strip away all the superfluous chars
+            self._about = self._ask_string('about')
+        return self._about
 
     def reboot(self):
         """Run setup routine again, for resetting LED array."""
         # This just returns nothing important
-        self.ask('reboot')
+        self.ask(_CMD_REBOOT)
+        self._parameters_json = None
+        self._led_positions_NA = None
+        self._board_settings.clear()
 
     @property
     def version(self) -> str:
         """Display controller version number."""
-        # returns version number, probably not a decimal number, so
-        # read it as a string
-        return self._ask_string('version')
+        # The firmware cannot change while the port is open
+        if self._firmware_version is None:
+            # returns version number, probably not a decimal number, so
+            # read it as a string
+            self._firmware_version = self._ask_string('version')
+        return self._firmware_version
 
     @property
     def autoclear(self) -> bool:
@@ -813,10 +1224,10 @@ class Illuminate:
         # autoclear bit, so we must remember the state of autoclear
         # in python, and just return the cached value
         if value:
-            self._ask_string('ac.1')
+            self._ask_setting('autoclear', _CMD_AUTOCLEAR_ON)
             self._autoclear = True
         else:
-            self._ask_string('ac.0')
+            self._ask_setting('autoclear', _CMD_AUTOCLEAR_OFF)
             self._autoclear = False
 
     @property
@@ -837,10 +1248,10 @@ class Illuminate:
     @with_thread_lock
     def autoupdate(self, value: bool=None) -> None:
         if value:
-            self._ask_string('au.1')
+            self._ask_setting('autoupdate', _CMD_AUTOUPDATE_ON)
             self._autoupdate = True
         else:
-            self._ask_string('au.0')
+            self._ask_setting('autoupdate', _CMD_AUTOUPDATE_OFF)
             self._autoupdate = False
 
     @property
@@ -850,7 +1261,8 @@ class Illuminate:
 
     @NA.setter
     def NA(self, value: float) -> None:
-        self.ask(f'na.{value*100:.0f}')
+        if self._ask_setting('NA', b'na.%d\n' % round(value * 100)):
+            self._parameters_json = None
         self._NA = round(value, 2)
 
     @property
@@ -888,23 +1300,27 @@ class Illuminate:
     @color.setter
     @with_thread_lock
     def color(self, c: Union[float, Iterable[float]]):
-        if not isinstance(c, collections.abc.Iterable):
+        if isinstance(c, (int, float, np.number)):
             # Make it a 3 tuple
             c = (c, c, c)
 
         # Downcast to int for safety
-        max_color_int = (1 << self._interface_bit_depth) - 1
-        c = tuple(int(i * self._scale_factor) for i in c)
+        scale_factor = self._scale_factor
+        red, green, blue = c
+        c = (int(red * scale_factor),
+             int(green * scale_factor),
+             int(blue * scale_factor))
 
         # Clips color channel to approximately 255 if user input exceeds that
-        if any(i > max_color_int for i in c):
+        max_color_int = self._interface_max
+        if max(c) > max_color_int:
             c = tuple(min(i, max_color_int) for i in c)
             user_color = tuple(float(i / self._scale_factor) for i in c)
             warn(f"Maximum color ({self.color_maximum_value})"
                  " exceeded. Requested color clipped to"
                  f" {user_color}", stacklevel=2)
 
-        self.ask(f'sc.{c[0]}.{c[1]}.{c[2]}')
+        self._ask_setting('color', b'sc.%d.%d.%d\n' % c)
         # Cache the color for future use
         self._color = c
         # man, mypy is annoying.... i can't get typing for this one to work
@@ -929,7 +1345,8 @@ class Illuminate:
     @maximum_current.setter
     def maximum_current(self, value):
         value = int(round(value))
-        self.ask('setMaxCurrent.' + f"{value:d}")
+        self.ask(b'setMaxCurrent.%d\n' % value)
+        self._parameters_json = None
         # Cache the value so that firmwares with version less
         # than 1.20.6 can read it back in python.
         # Prior version 1.20.6, we can only set, but not get the value.
@@ -938,13 +1355,13 @@ class Illuminate:
     @property
     def color_maximum_value(self):
         """Maximum color intensity that can provided to the LED board."""
-        return ((1 << self._interface_bit_depth) - 1) / self._scale_factor
+        return self._interface_max / self._scale_factor
 
     @property
     def color_minimum_increment(self):
         """Minium intensity increment that can be provided to the LED board."""
         if self._precision == 'float':
-            return 1 / ((1 << self._interface_bit_depth) - 1)
+            return 1 / self._interface_max
         else:
             return 1 / self._scale_factor
 
@@ -956,7 +1373,10 @@ class Illuminate:
     @array_distance.setter
     def array_distance(self, distance: float):
         # sad, [100 * dist(mm) - -or-- 1000 * dist(cm)]
-        self.ask('sad.' + f'{distance*1000*100:.0f}')
+        if self._ask_setting(
+                'array_distance', b'sad.%d\n' % round(distance * 1000 * 100)):
+            self._parameters_json = None
+            self._led_positions_NA = None
         self._array_distance = distance
 
     @property
@@ -1002,38 +1422,51 @@ class Illuminate:
             If this is single item, then the single LED is turned on.
             If this is an iterable, such as a list, tuple, or numpy array,
             turn on all the LEDs listed in the iterable. ND numpy arrays are
-            first converted to 1D numpy arrays, then to a list.
+            first converted to 1D numpy arrays.
 
         """
         if isinstance(leds, np.ndarray):
-            # As 1D
-            leds = leds.reshape(-1).tolist()
-
-        if not leds:
-            if self.autoclear:
-                self.clear()
-            return
+            # As 1D, copied so that the cached LEDs are not shared with
+            # the caller. Integer arrays are encoded without going through
+            # a list.
+            leds = leds.flatten()
+            if leds.size == 0 or leds.dtype.kind not in 'iu':
+                leds = leds.tolist()
+
+        if not isinstance(leds, np.ndarray):
+            if not leds:
+                if self.autoclear:
+                    self.clear()
+                return
 
-        # make leds a list
-        if isinstance(leds, collections.abc.Iterable):
-            leds = list(leds)
-        else:
-            # Make a singleton a list
-            leds = [leds]
+            # make leds a list
+            # Check the common concrete types before the much slower
+            # abstract base class
+            if isinstance(leds, (list, tuple, range)):
+                leds = list(leds)
+            elif isinstance(leds, (int, np.integer)):
+                # Make a singleton a list
+                leds = [leds]
+            elif isinstance(leds, collections.abc.Iterable):
+                leds = list(leds)
+            else:
+                # Make a singleton a list
+                leds = [leds]
 
-        cmd = 'l.' + '.'.join((str(led) for led in leds))
+        led_bytes = _encode_led_numbers(leds, self._led_count)
+        cmd = b'l.' + b'.'.join(led_bytes)
         # SYNTAX:
         # l.[led  # ].[led #], ...
         # This will raise an error on bad syntax
         if len(cmd) < MAX_ARGUMENT_CHAR_COUNT:
-            self.ask(cmd)
+            self.ask(cmd + b'\n')
         else:
             # Need to breakup the command
             # otherwise serial transmission might fail
             # Mark noticed that one attempts to send more than 64 bytes of
             # data at a time, data gets "lost"
             # This seems to be a buffer issue in the teensy.
-            chars_per_led = 1 + len(str(max(leds)))
+            chars_per_led = 1 + max(map(len, led_bytes))
             max_leds_per_command = (
                 MAX_ARGUMENT_CHAR_COUNT - 2) // chars_per_led
             command_chunks = (
@@ -1042,24 +1475,45 @@ class Illuminate:
             old_autoclear = self.autoclear
             old_autoupdate = self.autoupdate
             # if autoupdate isn't found, then gracefully set the LEDs
-            # sequentially, even if it blinks for the user
-            self.autoupdate = False
+            # sequentially, even if it blinks for the user. The errors
+            # replied to the toggles are ignored by _ask_many.
+            # Only send the toggles that actually change the state of the
+            # board. The board ends up in the same state, so the cached
+            # autoclear and autoupdate values stay valid.
+            commands = []
+            if old_autoupdate:
+                commands.append(_CMD_AUTOUPDATE_OFF)
             for i in range(command_chunks):
-                these_leds = leds[
+                these_leds = led_bytes[
                     i * max_leds_per_command:(i + 1) * max_leds_per_command]
-                cmd = 'l.' + '.'.join(str(led) for led in these_leds)
-                self.ask(cmd)
-                if i == 0:
-                    self.autoclear = False
-            self.autoclear = old_autoclear
-            self.autoupdate = old_autoupdate
+                commands.append(b'l.' + b'.'.join(these_leds) + b'\n')
+                if i == 0 and old_autoclear:
+                    commands.append(_CMD_AUTOCLEAR_OFF)
+            if old_autoclear:
+                commands.append(_CMD_AUTOCLEAR_ON)
             if old_autoupdate:
-                self.update()
+                commands.append(_CMD_AUTOUPDATE_ON)
+                commands.append(_CMD_UPDATE)
+            try:
+                self._ask_many(commands)
+            except Exception:
+                # Put the board back in the state we think it is in
+                self._board_settings.pop('autoclear', None)
+                self._board_settings.pop('autoupdate', None)
+                self.autoclear = old_autoclear
+                self.autoupdate = old_autoupdate
+                raise
         self._led = leds
 
     @property
     def _led(self):
-        return self._led_cache
+        led_cache = self._led_cache
+        if isinstance(led_cache, np.ndarray):
+            # LED numbers may be cached as an array, only build the list
+            # once somebody asks for it
+            led_cache = led_cache.tolist()
+            self._led_cache = led_cache
+        return led_cache
 
     @_led.setter
     def _led(self, value):
@@ -1070,48 +1524,53 @@ class Illuminate:
         # The LED state might not exist if the system hasn't booted up
         # Therefore, skip any errors that may occur on "Unefined variable"
         # self._led_state
-        if self._led_state is None:
+        led_state = self._led_state_array
+        if led_state is None:
             return
         # Certain functions, like special patterns, or fill array
         # Will clear the LEDs regardless of the `autoclear` functionality
         # THerefore,allow them to add the force clear parameter
-        color = np.asarray(self.color)
+        color = self.color
         if force_clear or self.autoclear:
-            self._led_state.data[...] = 0
+            led_state.fill(0)
             led_cache = led
         else:
-            if np.array_equal(color, np.zeros_like(color)):
+            if isinstance(led, np.ndarray):
+                led = led.tolist()
+            if not any(color):
                 # When the LEDs are set to 0 color, we want to consider
                 # them "off" in the cached state
-                led_cache = list(set(self._led_cache).difference(led))
+                led_cache = list(set(self._led).difference(led))
             else:
-                led_cache = list(set(self._led_cache).union(led))
-        self._led_state.data[led] = color
+                led_cache = list(set(self._led).union(led))
+        if len(led) != 0:
+            # A single fancy indexing assignment writes every LED at once
+            led_state[led] = color
         self._led_cache = led_cache
 
     @with_thread_lock
     def clear(self) -> None:
         """Clear the LED array."""
-        self.ask('x')
+        self.ask(_CMD_CLEAR)
         self._update_led_state([], force_clear=True)
 
     def update(self) -> None:
         """Update the LED array."""
-        self.ask('u')
+        self.ask(_CMD_UPDATE)
 
     @with_thread_lock
     def fill_array(self) -> None:
         """Fill the LED array with default color."""
-        self.ask('ff')
-        self._update_led_state(list(range(self._led_count)))
+        self.ask(_CMD_FILL_ARRAY)
+        self._update_led_state(self._all_leds_array)
 
     def brightfield(self) -> None:
         """Display brightfield pattern."""
-        self.ask('bf')
+        self.ask(_CMD_BRIGHTFIELD)
 
     def darkfield(self) -> None:
         """Display darkfield pattern."""
-        self.ask('df')
+        self.ask(_CMD_DARKFIELD)
 
     def half_circle(self, pattern: str) -> None:
         """Illuminate half circle(DPC) pattern.
@@ -1121,26 +1580,38 @@ class Illuminate:
         pattern: should be 'top', 'bottom', 'left' or 'right'
 
         """
-        self.ask('dpc.' + pattern)
+        self.ask(f'dpc.{pattern}')
 
     def half_circle_color(self, red: int, green: int, blue: int) -> None:
         """Illuminate color DPC pattern."""
         # TODO: should this be a property?
         self.ask(f'cdpc.{red}.{green}.{blue}')
+        # The color may have been changed
+        self._board_settings.pop('color', None)
 
     def annulus(self, minNA: float, maxNA: float) -> None:
         """Display annulus pattern set by min/max NA."""
         # an.[minNA * 100].[maxNA * 100]
-        self.ask(f"an.{minNA*100:.0f}.{maxNA*100:.0f}")
+        self.ask(f"an.{round(minNA * 100)}.{round(maxNA * 100)}")
+        # The NA may have been changed
+        self._board_settings.pop('NA', None)
+        self._parameters_json = None
+        self._led_positions_NA = None
 
     def half_annulus(self, pattern: str, minNA: float, maxNA: float) -> None:
         """Illuminate half annulus."""
         # Find out what the types are
-        self.ask(f"ha.{type}.{minNA*100:.0f}.{maxNA*100:.0f}")
+        self.ask(f"ha.{pattern}.{round(minNA * 100)}.{round(maxNA * 100)}")
+        # The NA may have been changed
+        self._board_settings.pop('NA', None)
+        self._parameters_json = None
+        self._led_positions_NA = None
 
     def draw_quadrant(self, red: int, green: int, blue: int) -> None:
         """Draws single quadrant."""
         self.ask(f'dq.{red}.{green}.{blue}')
+        # The color may have been changed
+        self._board_settings.pop('color', None)
 
     def illuminate_uv(self, number: int) -> None:
         """Illuminate UV LED."""
@@ -1164,7 +1635,7 @@ class Illuminate:
         if delay is None:
             self.ask(cmd)
         else:
-            self.ask(cmd + '.' + f"{delay * 1000:.0f}")
+            self.ask(f'{cmd}.{round(delay * 1000)}')
 
     def scan_full(self, delay: Optional[float]=None) -> None:
         """Scan all active LEDs.
@@ -1194,7 +1665,7 @@ class Illuminate:
 
     @sequence_length.setter
     def sequence_length(self, length: int):
-        self.ask('ssl.' + str(length))
+        self.ask(f'ssl.{length}')
         self._sequence_length = length
 
     @property
@@ -1207,7 +1678,8 @@ class Illuminate:
 
     @sequence.setter
     def sequence(self, LED_sequence: List[int]) -> None:
-        self.ask('ssv.' + '.'.join([str(led) for led in LED_sequence]))
+        led_bytes = _encode_led_numbers(LED_sequence, self._led_count)
+        self.ask(b'ssv.' + b'.'.join(led_bytes) + b'\n')
         self._sequence = LED_sequence
 
     def run_sequence(self, delay: float, trigger_modes: List[float]) -> None:
@@ -1220,8 +1692,8 @@ class Illuminate:
         # rseq.[Delay between each pattern in ms].
         #      [trigger mode  index 0].[index 1].[index 2]
         raise NotImplementedError('Never tested')
-        cmd = ('rseq.' + f'{delay * 1000:.0f}' + '.' +
-               '.'.join([f'{mode:.0f}' for mode in trigger_modes]))
+        cmd = (f'rseq.{round(delay * 1000)}.' +
+               '.'.join([str(round(mode)) for mode in trigger_modes]))
         self.ask(cmd)
 
     def run_sequence_fast(self, delay, trigger_modes):
@@ -1268,14 +1740,12 @@ class Illuminate:
         1: Trigger at start of frame
         2: Trigger each update of pattern
         """
-        cmd = 'sseq'
-        cmd = cmd + '.' + ('1' if trigger_start else '0')
-        cmd = cmd + '.' + ('1' if trigger_update else '0')
-        return self.ask(cmd)
+        return self.ask(
+            f'sseq.{int(bool(trigger_start))}.{int(bool(trigger_update))}')
 
     def reset_sequence(self):
         """Reset sequence index to start."""
-        return self.ask('reseq')
+        return self.ask(_CMD_RESET_SEQUENCE)
 
     @property
     def sequence_bit_depth(self):
@@ -1290,7 +1760,8 @@ class Illuminate:
         if bitdepth not in [1, 8]:
             raise ValueError("Needs to be 1 or 8")
 
-        self.ask('ssbd.' + str(bitdepth))
+        self.ask(f'ssbd.{bitdepth}')
+        self._parameters_json = None
         self._sequence_bit_depth = bitdepth
 
     def find_max_brightness(self, num_leds, color_ratio=None):
@@ -1332,7 +1803,7 @@ class Illuminate:
     def trigger(self, index):
         """Output TTL trigger pulse to camera."""
         raise NotImplementedError("Never tested")
-        return self.ask('tr.' + str(index))
+        return self.ask(f'tr.{index}')
 
     def trigger_setup(self, index, pin_index, delay):
         """Set up hardware(TTL) triggering."""
@@ -1357,12 +1828,12 @@ class Illuminate:
     def trigger_test(self, index):
         """Wait for trigger pulses on the defined channel."""
         raise NotImplementedError("I haven't implemented this yet")
-        return self.write('trt.' + str(index))
+        return self.write(f'trt.{index}')
 
     def draw_channel(self, led):
         """Draw LED by hardware channel(use for debugging)."""
         raise NotImplementedError("Never tested")
-        return self.ask('dc.' + str(led))
+        return self.ask(f'dc.{led}')
 
     def debug(self, value=None):
         """Set a debug flag. Toggles if value is None."""
@@ -1387,12 +1858,10 @@ class Illuminate:
 
     def set_pin_order(self, red_pin, green_pin, blue_pin, led=None):
         """Set pin order(R / G / B) for setup purposes."""
-        # Big hack, the LED class basically does what we want,
-        # Even though these are pins and not RGB values
         if led is not None:
-            cmd = 'spo.' + '.'.join([led, red_pin, green_pin, blue_pin])
+            cmd = f'spo.{led}.{red_pin}.{green_pin}.{blue_pin}'
         else:
-            cmd = 'spo.' + '.'.join([red_pin, green_pin, blue_pin])
+            cmd = f'spo.{red_pin}.{green_pin}.{blue_pin}'
         raise NotImplementedError("Never tested")
         return self.write(cmd)
 
@@ -1405,7 +1874,7 @@ class Illuminate:
             None
 
         """
-        return self.ask('delay.' + f'{t*1000:.0f}')
+        return self.ask(b'delay.%d\n' % round(t * 1000))
 
     def print_values(self):
         """Print LED value for software interface."""
@@ -1417,8 +1886,12 @@ class Illuminate:
         """Print system parameters in a json file.
 
         NA, LED Array z - distance, etc.
+
+        The reply is cached until one of these parameters is changed.
         """
-        return self._ask_string('pp')
+        if self._parameters_json is None:
+            self._parameters_json = self._ask_string('pp')
+        return self._parameters_json
 
     @property
     def led_positions(self):
@@ -1442,9 +1915,11 @@ class Illuminate:
             This dataarray contains a Nx3 matrix that has rows with the
             ``z, y, x`` coordinates of the leds.
         """
-        warn("The positons_as_xarray function has been Deprecated and will be "
-             "removed in a future version. Use the led_positions attribute "
-             "directly.")
+        if not Illuminate._positions_as_xarray_warned:
+            warn("The positons_as_xarray function has been Deprecated and "
+                 "will be removed in a future version. Use the led_positions "
+                 "attribute directly.")
+            Illuminate._positions_as_xarray_warned = True
         return self.led_positions
 
     @property
@@ -1452,10 +1927,14 @@ class Illuminate:
         """Print the position of each LED in NA coordinates.
 
         Not working: See[PR  # 8](https://github.com/zfphil/illuminate/pull/8)
+
+        The reply is cached until the array distance is changed.
         """
         # I don't use this (yet), so a pull request is welcome for this
-        j = json.loads(self._ask_string('pledposna'))
-        return j['led_position_list_na']
+        if self._led_positions_NA is None:
+            j = self._ask_json('pledposna')
+            self._led_positions_NA = j['led_position_list_na']
+        return self._led_positions_NA
 
     @with_thread_lock
     def discoparty_demo(self, n_leds=1, time=10):
@@ -1470,7 +1949,7 @@ class Illuminate:
             The amount of time to run the paterns in seconds
 
         """
-        self.write('disco.' + str(n_leds))
+        self.write(b'disco.%d\n' % n_leds)
         self._finish_demo(time)
 
     @with_thread_lock
@@ -1487,7 +1966,7 @@ class Illuminate:
         """
         if self.serial is None:
             raise RuntimeError("__init__ must be successfully called first")
-        self.write('demo')
+        self.write(_CMD_DEMO)
         previous_timeout = self.serial.timeout
         self.serial.timeout = 6  # Seems to blink for around 5 seconds
         try:
@@ -1503,20 +1982,40 @@ class Illuminate:
         # Basically, if you let this one go on, and it actually returns
         # not implemented yet, then your read/write requests will always be
         # off by 1
-        self.write('water')
+        self.write(_CMD_WATER_DROP_DEMO)
         self._finish_demo(time)
 
     @with_thread_lock
     def _finish_demo(self, time: float) -> None:
         if self.serial is None:
             raise RuntimeError("__init__ must be successfully called first")
-        sleep(self.serial.timeout)
-
-        # If something is waiting so soon, then it is probably an error
-        if self.serial.in_waiting:
+        # Demos may change any setting of the board
+        self._board_settings.clear()
+        self._parameters_json = None
+        self._led_positions_NA = None
+        serial = self.serial
+        buffer = self._read_buffer
+        # The board ignores commands until the demo is over
+        deadline = monotonic() + time
+        # If something is received so soon, then it is probably an error
+        # Block on the port instead of sleeping for the whole timeout so
+        # that errors are reported as soon as they arrive
+        if not buffer:
+            timeout = serial.timeout
+            if time < timeout:
+                # Don't wait for errors for longer than the demo itself
+                serial.timeout = time
+                try:
+                    buffer += serial.read(1)
+                finally:
+                    serial.timeout = timeout
+            else:
+                buffer += serial.read(1)
+        if buffer:
             p = self.read_paragraph()
             self._check_output(p)
             return
 
-        sleep(max(time - self.serial.timeout, 0))
+        # Wait out the rest of the demo before stopping it
+        sleep(max(deadline - monotonic(), 0))
         self.ask('')
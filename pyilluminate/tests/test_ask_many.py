@@ -0,0 +1,233 @@
+from pyilluminate import Illuminate
+from pyilluminate.illuminate import MAX_ARGUMENT_CHAR_COUNT
+import numpy as np
+import pytest
+
+
+class ReplyingSerial:
+    """Closed serial port stand-in that replies to every command."""
+
+    is_open = False
+
+    def __init__(self):
+        self.commands = []
+        # Command that gets an error reply, in addition to bad
+        self.fail_on = None
+        # Replies to specific commands, by command name
+        self.replies = {}
+        self.replies_read = 0
+        self.max_pending_size = 0
+        self._data = bytearray()
+
+    def write(self, data):
+        self.commands.append(data)
+        pending_size = sum(map(len, self.commands[self.replies_read:]))
+        self.max_pending_size = max(self.max_pending_size, pending_size)
+        name = data.rstrip().split(b'.')[0]
+        if name == b'bad' or data == self.fail_on:
+            self._data += b'ERROR: bad command\r\n-==-\r\n'
+        elif name in self.replies:
+            self._data += self.replies[name] + b'\r\n-==-\r\n'
+        else:
+            self._data += b'value: %d\r\n-==-\r\n' % len(data)
+
+    @property
+    def in_waiting(self):
+        return len(self._data)
+
+    def read(self, size=1):
+        chunk = bytes(self._data[:size])
+        del self._data[:size]
+        return chunk
+
+
+class CountingIlluminate(Illuminate):
+    __slots__ = []
+
+    def _read_paragraph_bytes(self):
+        self.serial.replies_read += 1
+        return super()._read_paragraph_bytes()
+
+
+def make_light():
+    light = CountingIlluminate(open_device=False, use_lock=False)
+    light.serial = ReplyingSerial()
+    return light
+
+
+def test_ask_many():
+    light = make_light()
+    commands = [b'l.%d\n' % i for i in range(100)]
+    assert light._ask_many(commands) == [len(c) for c in commands]
+    assert light.serial.commands == commands
+    assert light.serial.replies_read == len(commands)
+    assert light.serial.max_pending_size <= MAX_ARGUMENT_CHAR_COUNT
+
+
+def test_ask_many_error():
+    light = make_light()
+    commands = [b'au.0\n', b'bad\n', b'ac.0\n', b'ac.1\n']
+    with pytest.raises(RuntimeError):
+        light._ask_many(commands)
+    # All the replies have been read
+    assert light.serial.replies_read == len(light.serial.commands)
+    assert light.ask('x') == 2
+
+
+def test_unchanged_settings_are_not_sent():
+    light = make_light()
+    light.NA = 0.5
+    light.NA = 0.5
+    light.autoclear = False
+    light.autoclear = False
+    assert light.serial.commands == [b'na.50\n', b'ac.0\n']
+    light.annulus(0.1, 0.2)
+    light.NA = 0.5
+    assert light.serial.commands[-1] == b'na.50\n'
+    assert light.NA == 0.5
+
+
+def test_batch():
+    light = make_light()
+    with light.batch():
+        light.NA = 0.5
+        with light.batch():
+            light.autoclear = False
+        assert light.ask('x') is None
+        assert light.serial.commands == []
+    assert light.serial.commands == [b'na.50\n', b'ac.0\n', b'x\n']
+    assert light.serial.replies_read == 3
+
+
+def test_batch_error():
+    light = make_light()
+    with pytest.raises(RuntimeError):
+        with light.batch():
+            light.autoclear = False
+            light.ask('bad')
+    assert light.serial.replies_read == len(light.serial.commands)
+    # The setting is sent again since it may not have been applied
+    light.autoclear = False
+    assert light.serial.commands[-1] == b'ac.0\n'
+
+
+def test_tell():
+    light = make_light()
+    assert light._tell(b'ac.1\n') is None
+    with pytest.raises(RuntimeError):
+        light._tell(b'bad\n')
+    assert light.ask('x') == 2
+
+
+def test_sequence_encoding():
+    light = make_light()
+    light._led_count = 10
+    light.sequence = np.array([1, 12, -1])
+    light.sequence = np.array([], dtype=int)
+    light.sequence = np.array([1., 2.])
+    light.sequence = [np.int64(3), 4]
+    assert light.serial.commands == [
+        b'ssv.1.12.-1\n', b'ssv.\n', b'ssv.1.0.2.0\n', b'ssv.3.4\n']
+
+
+# Every LED number takes up to 4 characters, 15 of them fit in a command
+LED_CHUNKS = [
+    b'l.' + b'.'.join(b'%d' % i for i in range(start, start + 15)) + b'\n'
+    for start in range(0, 300, 15)
+]
+
+
+@pytest.mark.parametrize('autoclear, autoupdate, expected', [
+    (True, True,
+     [b'au.0\n', LED_CHUNKS[0], b'ac.0\n', *LED_CHUNKS[1:],
+      b'ac.1\n', b'au.1\n', b'u\n']),
+    (True, False,
+     [LED_CHUNKS[0], b'ac.0\n', *LED_CHUNKS[1:], b'ac.1\n']),
+    (False, True,
+     [b'au.0\n', *LED_CHUNKS, b'au.1\n', b'u\n']),
+    (False, False, LED_CHUNKS),
+])
+def test_turn_on_many_leds(autoclear, autoupdate, expected):
+    light = make_light()
+    light._led_count = 300
+    light.autoclear = autoclear
+    light.autoupdate = autoupdate
+    light.serial.commands.clear()
+    light.serial.replies_read = 0
+
+    light.led = range(300)
+    assert light.serial.commands == expected
+    assert light.serial.replies_read == len(expected)
+    assert light.serial.max_pending_size <= MAX_ARGUMENT_CHAR_COUNT
+    assert light.autoclear == autoclear
+    assert light.autoupdate == autoupdate
+
+
+def test_turn_on_many_leds_error():
+    light = make_light()
+    light._led_count = 300
+    light.autoclear = True
+    light.autoupdate = True
+    light.serial.fail_on = LED_CHUNKS[3]
+
+    with pytest.raises(RuntimeError):
+        light.led = range(300)
+    assert light.serial.replies_read == len(light.serial.commands)
+    # The toggles were sent again to restore the board
+    assert light.serial.commands[-2:] == [b'ac.1\n', b'au.1\n']
+    assert light.autoclear
+    assert light.autoupdate
+    assert light._board_settings['autoclear'] == b'ac.1\n'
+    assert light._board_settings['autoupdate'] == b'au.1\n'
+
+
+def test_turn_on_many_leds_without_autoupdate():
+    light = make_light()
+    light._led_count = 300
+    light.autoclear = True
+    light.autoupdate = True
+    light.serial.commands.clear()
+    light.serial.replies_read = 0
+    # Older firmware does not know the autoupdate command
+    light.serial.replies[b'au'] = b'ERROR: Command au not found'
+
+    light.led = range(300)
+    assert light.serial.commands == [
+        b'au.0\n', LED_CHUNKS[0], b'ac.0\n', *LED_CHUNKS[1:],
+        b'ac.1\n', b'au.1\n', b'u\n']
+    assert light.serial.replies_read == len(light.serial.commands)
+    assert light.autoclear
+
+
+def test_autoupdate_not_found():
+    light = make_light()
+    # Older firmware does not know the autoupdate command
+    light.serial.replies[b'au'] = b'ERROR: Command au not found'
+    light.autoupdate = True
+    assert light.autoupdate
+    with light.batch():
+        light.autoupdate = False
+        light.autoclear = True
+    assert not light.autoupdate
+    assert light.serial.commands == [b'au.1\n', b'au.0\n', b'ac.1\n']
+    assert light.serial.replies_read == 3
+    # Other errors are still raised
+    light.serial.fail_on = b'na.50\n'
+    with pytest.raises(RuntimeError):
+        light.NA = 0.5
+
+
+def test_patterns_reset_cached_parameters():
+    light = make_light()
+    light.serial.replies[b'pp'] = b'{"NA": 0.5}'
+    light.serial.replies[b'pledposna'] = b'{"led_position_list_na": {}}'
+    light.parameters_json
+    light.led_positions_NA
+    light.annulus(0.1, 0.2)
+    light.parameters_json
+    light.led_positions_NA
+    light.half_annulus('t', 0.1, 0.2)
+    light.parameters_json
+    light.led_positions_NA
+    assert light.serial.commands.count(b'pp\n') == 3
+    assert light.serial.commands.count(b'pledposna\n') == 3
@@ -1,5 +1,49 @@
 import pyilluminate
+import pytest
 
 
 def test_version():
     pyilluminate.__version__
+
+
+def test_comports_cache(monkeypatch):
+    import serial.tools.list_ports
+    from pyilluminate import illuminate
+
+    calls = []
+
+    def comports():
+        calls.append(None)
+        return []
+
+    monkeypatch.setattr(serial.tools.list_ports, 'comports', comports)
+    monkeypatch.setattr(illuminate, '_comports_cache', (0.0, None, None))
+
+    assert illuminate.Illuminate.find() == []
+    assert illuminate.Illuminate.list_all_serial_numbers() == []
+    assert len(calls) == 1
+
+    illuminate.Illuminate.refresh_ports()
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError):
+        illuminate.get_port_serial_number('COM1')
+    # Not found in the cached listing, so the ports are listed again
+    assert len(calls) == 3
+
+
+def test_serial_by_mac_address(monkeypatch):
+    from pyilluminate import Illuminate
+
+    monkeypatch.setattr(Illuminate, '_known_mac_addresses',
+                        {'01:23:45:67:89:ab': '1234567'})
+    assert Illuminate.serial_by_mac_address('01:23:45:67:89:AB') == '1234567'
+    assert Illuminate.serial_by_mac_address('01:23:45:67:89:ab') == '1234567'
+    with pytest.raises(RuntimeError):
+        Illuminate.serial_by_mac_address('01:23:45:67:89:00')
+
+
+def test_del_partially_initialized():
+    # Nothing was set, as if __init__ had raised right away
+    light = pyilluminate.Illuminate.__new__(pyilluminate.Illuminate)
+    light.__del__()
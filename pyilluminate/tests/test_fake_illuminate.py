@@ -1,4 +1,5 @@
 from pyilluminate.fake_illuminate import FakeIlluminate
+import numpy as np
 import pytest
 
 
@@ -43,3 +44,69 @@ def test_open_obvious_typo():
             light.obvious_typo = False
     finally:
         light.close()
+
+
+def test_no_instance_dict():
+    # All the attributes must be declared in __slots__
+    light = FakeIlluminate()
+    assert not hasattr(light, '__dict__')
+
+
+def test_chroma():
+    light = FakeIlluminate(N_leds=5)
+    assert list(light.chroma) == ['rgb', 'rgb', 'rgb', 'rgb', 'uv']
+    assert list(light.led_positions.chroma.values) == list(light.chroma)
+
+
+def test_brightness_unequal_color():
+    light = FakeIlluminate()
+    light.color = (1, 2, 1)
+    with pytest.raises(ValueError):
+        light.brightness
+
+
+def test_numpy_scalar_color():
+    light = FakeIlluminate()
+    light.color = np.float32(2)
+    assert tuple(light.color) == (2, 2, 2)
+    light.color = np.int64(3)
+    assert tuple(light.color) == (3, 3, 3)
+    light.color = np.asarray((1, 2, 3))
+    assert tuple(light.color) == (1, 2, 3)
+
+
+def test_led_groups():
+    light = FakeIlluminate(N_leds=5)
+    assert light.all_leds == [0, 1, 2, 3, 4]
+    assert light.rgb_leds == [0, 1, 2, 3]
+    assert light.uv_leds == [4]
+    # The groups are lists, adding them joins them
+    assert light.rgb_leds + light.uv_leds == light.all_leds
+    light.led = light.rgb_leds + light.uv_leds
+    assert light.led == light.all_leds
+    # Changing the returned list does not change the groups
+    light.all_leds[0] = 1
+    assert light.all_leds == [0, 1, 2, 3, 4]
+
+
+def test_led_keeps_values():
+    light = FakeIlluminate()
+    # LED numbers are not rounded
+    with pytest.raises(IndexError):
+        light.led = [1.7]
+    light.led = 3
+    assert list(light.led) == [3]
+    leds = np.array([[1, 2], [3, 4]])
+    light.led = leds
+    assert list(light.led) == [1, 2, 3, 4]
+    leds[0, 0] = 5
+    assert list(light.led) == [1, 2, 3, 4]
+
+
+def test_batch():
+    light = FakeIlluminate()
+    with light.batch():
+        light.color = 2
+        light.led = [1, 2]
+    assert tuple(light.color) == (2, 2, 2)
+    assert list(light.led) == [1, 2]
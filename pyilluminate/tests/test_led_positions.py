@@ -0,0 +1,35 @@
+from pyilluminate.tests.test_ask_many import make_light
+import json
+import numpy as np
+import pytest
+
+# x and y in mm, z in cm, as sent by the firmware
+POSITIONS = {
+    '0': [1.0, -2.0, 5.0],
+    '1': [-3.5, 4.0, 6.0],
+    '2': [0.0, -0.5, 7.5],
+}
+# z, y, x in meters
+EXPECTED = np.array([
+    [0.05, -0.002, 0.001],
+    [0.06, 0.004, -0.0035],
+    [0.075, -0.0005, 0.0],
+])
+
+
+@pytest.mark.parametrize('order', [['0', '1', '2'], ['2', '0', '1']])
+def test_read_led_positions(order):
+    light = make_light()
+    light.N_leds = 3
+    light.serial_number = 'SN'
+    light._firmware_version = '1.20.0'
+    light._device_name = 'test'
+    light.serial.replies[b'pledpos'] = json.dumps(
+        {'led_position_list_cartesian': {
+            key: POSITIONS[key] for key in order}}).encode()
+
+    led_positions = light.led_positions
+    assert light.serial.commands == [b'pledpos\n']
+    np.testing.assert_allclose(led_positions.values, EXPECTED)
+    assert list(led_positions.zyx.values) == ['z', 'y', 'x']
+    assert list(led_positions.led_number.values) == [0, 1, 2]
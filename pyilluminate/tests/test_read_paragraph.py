@@ -0,0 +1,48 @@
+from pyilluminate import Illuminate
+import pytest
+
+
+class ChunkedSerial:
+    """Closed serial port stand-in that hands out data in fixed chunks."""
+
+    def __init__(self, data, chunk_size):
+        self._data = data
+        self._chunk_size = chunk_size
+
+    @property
+    def in_waiting(self):
+        return min(len(self._data), self._chunk_size)
+
+    def read(self, size=1):
+        chunk = self._data[:size]
+        self._data = self._data[size:]
+        return chunk
+
+    def readline(self):
+        end = self._data.find(b'\n') + 1 or len(self._data)
+        return self.read(end)
+
+    is_open = False
+
+
+def make_light(data, chunk_size):
+    light = Illuminate(open_device=False, use_lock=False)
+    light.serial = ChunkedSerial(data, chunk_size)
+    return light
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1000])
+def test_read_paragraph(chunk_size):
+    data = (b'first line\r\n-==-\r\n'
+            b'second\r\n -==- \r\n'
+            b'left over\n')
+    light = make_light(data, chunk_size)
+    assert light.read_paragraph() == ['first line']
+    assert light.read_paragraph(raw=True) == ['second\r\n', ' -==- \r\n']
+    assert light.readline() == 'left over\n'
+
+
+def test_read_paragraph_timeout():
+    light = make_light(b'no end in sight\r\n', 4)
+    with pytest.raises(RuntimeError):
+        light.read_paragraph()